@@ -1,10 +1,14 @@
 import os
 import sys
 import logging
-import gradio as gr
-from textblob import TextBlob
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
-from tools import get_current_weather, simple_calculator
+from tools import tracing, resources
+
+with resources.measure_load("gradio"):
+    import gradio as gr
+from serving import launch_app, request_trace_context
 
 # Set up logging
 logging.basicConfig(
@@ -59,6 +63,15 @@ else:
     SERVER_PORT = int(os.getenv('SERVER_PORT', '7860'))
     MCP_SERVER = os.getenv('MCP_SERVER', 'True').lower() == 'true'
 
+# Sentiment calls Gradio runs at once (its default is 1). Must be at least
+# SENTIMENT_BATCH_SIZE for concurrent calls to reach the batcher together.
+SENTIMENT_CONCURRENCY_LIMIT = int(os.getenv('SENTIMENT_CONCURRENCY_LIMIT', '32'))
+
+# Warm-up primes the weather API connection (DNS, TCP, TLS) but doesn't call it.
+# WARMUP_WEATHER_CALL=true also makes one live request on every start and replica
+# restart: it uses API quota and can hold /readyz at 503 for up to 10s more.
+WARMUP_WEATHER_CALL = os.getenv('WARMUP_WEATHER_CALL', 'False').lower() == 'true'
+
 from smolagents.tools import tool
 
 @tool
@@ -72,118 +85,196 @@ def sentiment_analysis(text: str) -> dict:
     Returns:
         dict: A dictionary containing polarity, subjectivity, and a qualitative assessment.
     """
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity
-    subjectivity = blob.sentiment.subjectivity
-
-    if polarity > 0.1:
-        assessment = "positive"
-    elif polarity < -0.1:
-        assessment = "negative"
-    else:
-        assessment = "neutral"
+    from tools.sentiment_tool import analyze_sentiment
+
+    # Concurrent calls are scored together in micro-batches
+    return analyze_sentiment(text)
 
-    return {
-        "polarity": polarity,
-        "subjectivity": subjectivity,
-        "assessment": assessment
-    }
+def sentiment_interface(text: str, request: gr.Request = None) -> dict:
+    """Gradio interface function for sentiment tool"""
+    request_id, attributes = request_trace_context(request)
+    with tracing.start_trace("tool.sentiment_analysis", request_id=request_id, **attributes):
+        return sentiment_analysis(text)
 
-def weather_interface(location: str, unit: str) -> str:
+def weather_interface(location: str, unit: str, request: gr.Request = None) -> str:
     """Gradio interface function for weather tool"""
-    try:
-        result = get_current_weather(location=location, unit=unit)
-        logger.info(f"Weather result: {result}")
-        return result
-    except Exception as e:
-        error_msg = f"Error getting weather: {str(e)}"
-        logger.error(error_msg)
-        return f"Error: {error_msg} (Mock Data will be used next time)"
-
-def calculator_interface(operand1: float, operand2: float, operation: str) -> float:
+    from tools.weather_tool import get_current_weather
+
+    request_id, attributes = request_trace_context(request)
+    with tracing.start_trace("tool.get_current_weather", request_id=request_id, **attributes):
+        try:
+            result = get_current_weather(location=location, unit=unit)
+            logger.info(f"Weather result: {result}")
+            return result
+        except Exception as e:
+            error_msg = f"Error getting weather: {str(e)}"
+            logger.error(error_msg)
+            return f"Error: {error_msg} (Mock Data will be used next time)"
+
+def calculator_interface(operand1: float, operand2: float, operation: str, request: gr.Request = None) -> float:
     """Gradio interface function for calculator tool"""
-    return simple_calculator(operand1, operand2, operation)
+    from tools.calculator_tool import simple_calculator
 
-# Create tabbed interface
-with gr.Blocks(title="MCP Tools") as demo:
-    gr.Markdown("# MCP Tools Dashboard")
-    
-    with gr.Tab("Sentiment Analysis"):
-        with gr.Row():
-            text_input = gr.Textbox(
-                lines=3, 
-                placeholder="Enter text for sentiment analysis...",
-                label="Input Text"
-            )
-        analyze_btn = gr.Button("Analyze Sentiment")
-        sentiment_output = gr.JSON(label="Analysis Results")
-        analyze_btn.click(
-            fn=sentiment_analysis,
-            inputs=text_input,
-            outputs=sentiment_output
+    request_id, attributes = request_trace_context(request)
+    with tracing.start_trace("tool.simple_calculator", request_id=request_id, **attributes):
+        return simple_calculator(operand1, operand2, operation)
+
+@dataclass
+class AppConfig:
+    """Feature toggles deciding which tabs and tools create_app builds"""
+    sentiment: bool = True
+    weather: bool = True
+    calculator: bool = True
+    debug_tools: bool = False
+
+    @classmethod
+    def from_env(cls) -> "AppConfig":
+        """Read feature toggles from ENABLE_* environment variables"""
+        def enabled(name: str, default: bool) -> bool:
+            return os.getenv(name, str(default)).lower() == 'true'
+
+        return cls(
+            sentiment=enabled('ENABLE_SENTIMENT', cls.sentiment),
+            weather=enabled('ENABLE_WEATHER', cls.weather),
+            calculator=enabled('ENABLE_CALCULATOR', cls.calculator),
+            debug_tools=enabled('ENABLE_DEBUG_TOOLS', cls.debug_tools)
         )
-    
-    with gr.Tab("Weather Tool"):
-        with gr.Row():
-            location = gr.Textbox(label="Location", placeholder="e.g., Paris, FR")
-            unit = gr.Radio(
-                ["celsius", "fahrenheit"], 
-                label="Temperature Unit", 
-                value="celsius"
-            )
-        weather_btn = gr.Button("Get Weather")
-        weather_output = gr.Textbox(label="Weather Information")
-        
-        # Add debug information for Hugging Face Space
-        if HF_SPACE:
-            with gr.Accordion("Debug Info", open=False):
-                debug_info = gr.Textbox(
-                    value=f"Running on Hugging Face Space: {HF_SPACE}\n" +
-                          f"API Key configured: {os.environ.get('WEATHER_API_KEY') is not None}\n" +
-                          f"Space ID: {os.environ.get('SPACE_ID')}\n" +
-                          f"Python version: {sys.version}",
-                    label="Environment Information",
-                    interactive=False
+
+def create_app(config: Optional[AppConfig] = None) -> gr.Blocks:
+    """Build the tabbed MCP Tools interface with only the enabled tabs and tools"""
+    config = config or AppConfig.from_env()
+    logger.info(f"Building app with {config}")
+
+    with gr.Blocks(title="MCP Tools") as app:
+        gr.Markdown("# MCP Tools Dashboard")
+
+        if config.sentiment:
+            with gr.Tab("Sentiment Analysis"):
+                with gr.Row():
+                    text_input = gr.Textbox(
+                        lines=3, 
+                        placeholder="Enter text for sentiment analysis...",
+                        label="Input Text"
+                    )
+                analyze_btn = gr.Button("Analyze Sentiment")
+                sentiment_output = gr.JSON(label="Analysis Results")
+                analyze_btn.click(
+                    fn=sentiment_interface,
+                    inputs=text_input,
+                    outputs=sentiment_output,
+                    # The endpoint was named after the @tool object's class before
+                    # this handler wrapped it; keep the name existing callers use
+                    api_name="SimpleTool",
+                    concurrency_limit=SENTIMENT_CONCURRENCY_LIMIT
                 )
-        weather_btn.click(
-            fn=weather_interface,
-            inputs=[location, unit],
-            outputs=weather_output
-        )
-        
-        # Add example queries
-        gr.Examples(
-            examples=[
-                ["London, UK", "celsius"],
-                ["New York, US", "fahrenheit"],
-                ["Tokyo, JP", "celsius"],
-                ["Sydney, AU", "celsius"],
-            ],
-            inputs=[location, unit],
-        )
-    
-    with gr.Tab("Calculator"):
-        with gr.Row():
-            with gr.Column():
-                operand1 = gr.Number(label="First Number")
-                operand2 = gr.Number(label="Second Number")
-                operation = gr.Dropdown(
-                    ["add", "subtract", "multiply", "divide"],
-                    label="Operation",
-                    value="add"
+
+        if config.weather:
+            with gr.Tab("Weather Tool"):
+                with gr.Row():
+                    location = gr.Textbox(label="Location", placeholder="e.g., Paris, FR")
+                    unit = gr.Radio(
+                        ["celsius", "fahrenheit"], 
+                        label="Temperature Unit", 
+                        value="celsius"
+                    )
+                weather_btn = gr.Button("Get Weather")
+                weather_output = gr.Textbox(label="Weather Information")
+
+                # Add debug information for Hugging Face Space
+                if HF_SPACE:
+                    with gr.Accordion("Debug Info", open=False):
+                        gr.Textbox(
+                            value=f"Running on Hugging Face Space: {HF_SPACE}\n" +
+                                  f"API Key configured: {os.environ.get('WEATHER_API_KEY') is not None}\n" +
+                                  f"Space ID: {os.environ.get('SPACE_ID')}\n" +
+                                  f"Python version: {sys.version}",
+                            label="Environment Information",
+                            interactive=False
+                        )
+                weather_btn.click(
+                    fn=weather_interface,
+                    inputs=[location, unit],
+                    outputs=weather_output
                 )
-                calc_btn = gr.Button("Calculate")
-            result = gr.Number(label="Result")
-            
-        calc_btn.click(
-            fn=calculator_interface,
-            inputs=[operand1, operand2, operation],
-            outputs=result
-        )
 
-# MCP tools to expose - all are already decorated with @tool
+                # Add example queries
+                gr.Examples(
+                    examples=[
+                        ["London, UK", "celsius"],
+                        ["New York, US", "fahrenheit"],
+                        ["Tokyo, JP", "celsius"],
+                        ["Sydney, AU", "celsius"],
+                    ],
+                    inputs=[location, unit],
+                )
 
-if __name__ == "__main__":
+        if config.calculator:
+            with gr.Tab("Calculator"):
+                with gr.Row():
+                    with gr.Column():
+                        operand1 = gr.Number(label="First Number")
+                        operand2 = gr.Number(label="Second Number")
+                        operation = gr.Dropdown(
+                            ["add", "subtract", "multiply", "divide"],
+                            label="Operation",
+                            value="add"
+                        )
+                        calc_btn = gr.Button("Calculate")
+                    result = gr.Number(label="Result")
+
+                calc_btn.click(
+                    fn=calculator_interface,
+                    inputs=[operand1, operand2, operation],
+                    outputs=result
+                )
+
+        if config.debug_tools:
+            # Imported here so the lean build never loads the debug module
+            from debug_api import build_debug_tabs
+
+            with gr.Tab("API Debug"):
+                gr.Markdown("## API Environment Diagnostics")
+                build_debug_tabs()
+
+    return app
+
+def warmup_steps(config: AppConfig) -> list:
+    """Return the warm-up steps for the enabled tools: one dummy call each, plus HTTP pool priming"""
+    steps = []
+    if config.sentiment:
+        # Loads the pattern lexicon (and starts the batching worker when batching is on)
+        def warm_sentiment():
+            with resources.measure_load("sentiment_lexicon"):
+                sentiment_analysis("Warm-up call to load the sentiment lexicon.")
+        steps.append(("sentiment", warm_sentiment))
+    if config.weather:
+        from tools.weather_tool import get_current_weather, prime_connection
+        steps.append(("weather_connection", prime_connection))
+        if WARMUP_WEATHER_CALL:
+            steps.append(("weather", lambda: get_current_weather(location="London, UK", unit="celsius")))
+    if config.calculator:
+        from tools.calculator_tool import simple_calculator
+        steps.append(("calculator", lambda: simple_calculator(1, 1, "add")))
+    return steps
+
+_demo = None
+
+def __getattr__(name):
+    # `app.demo` is built on first access rather than at import, so entry points
+    # with their own config (app_with_debug.py) don't build a second app.
+    # HF Spaces and `gradio app.py` look the attribute up by name.
+    global _demo
+    if name == "demo":
+        if _demo is None:
+            # MCP tools to expose - all are already decorated with @tool
+            _demo = create_app(AppConfig.from_env())
+        return _demo
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def run_server(app: gr.Blocks, config: Optional[AppConfig] = None) -> None:
+    """Launch the app with MCP support if enabled, blocking until interrupted"""
+    config = config or AppConfig.from_env()
+    steps = warmup_steps(config)
     logger.info(f"Starting server on http://{SERVER_NAME}:{SERVER_PORT}")
     
     # Configure MCP endpoints if enabled
@@ -196,12 +287,7 @@ if __name__ == "__main__":
             
             # Launch with MCP support
             logger.info("Launching Gradio with MCP support...")
-            demo.launch(
-                server_name=SERVER_NAME,
-                server_port=SERVER_PORT,
-                debug=True,
-                show_error=True
-            )
+            launch_app(app, SERVER_NAME, SERVER_PORT, warmup_steps=steps)
             logger.info("Launched with MCP support.")
             logger.info(f"MCP endpoints available at: http://{SERVER_NAME}:{SERVER_PORT}/mcp/tools/{{tool_name}}/call")
         except Exception as e:
@@ -212,19 +298,13 @@ if __name__ == "__main__":
             
             # Standard launch without MCP
             logger.info("Launching Gradio without MCP...")
-            demo.launch(
-                server_name=SERVER_NAME,
-                server_port=SERVER_PORT,
-                debug=True,
-                show_error=True
-            )
+            launch_app(app, SERVER_NAME, SERVER_PORT, warmup_steps=steps)
     else:
         # Standard launch without MCP
         logger.info("MCP Server: Disabled by configuration.")
         logger.info("Launching Gradio without MCP...")
-        demo.launch(
-            server_name=SERVER_NAME,
-            server_port=SERVER_PORT,
-            debug=True,
-            show_error=True
-        )
+        launch_app(app, SERVER_NAME, SERVER_PORT, warmup_steps=steps)
+
+if __name__ == "__main__":
+    config = AppConfig.from_env()
+    run_server(create_app(config), config)
@@ -0,0 +1,175 @@
+import os
+import sys
+import gzip
+import time
+import argparse
+import subprocess
+import statistics
+import requests
+
+# Benchmark workload: (api_name, payload) pairs sent to the Gradio HTTP API.
+# api_name defaults to the event handler's function name in app.py;
+# the sentiment endpoint keeps its original name, SimpleTool.
+WORKLOAD = [
+    ("SimpleTool", ["I absolutely love this product, it works great and the support team was helpful. " * 20]),
+    ("weather_interface", ["London, UK", "celsius"]),
+    ("calculator_interface", [12.5, 3.0, "multiply"]),
+]
+
+# Large JSON responses that are fetched by every client on connect
+STATIC_PATHS = ["/config", "/gradio_api/info"]
+
+# App configurations compared by --startup: the statement that builds the app
+# the way its entry point does, and ENABLE_* environment overrides
+STARTUP_PROFILES = [
+    ("lean (production)", "import app; app.demo", {"ENABLE_DEBUG_TOOLS": "false"}),
+    ("debug tools", "import app_with_debug", {}),
+    ("calculator only", "import app; app.demo",
+     {"ENABLE_SENTIMENT": "false", "ENABLE_WEATHER": "false", "ENABLE_DEBUG_TOOLS": "false"}),
+]
+
+# Runs in a fresh interpreter: time the build statement passed as argv[1] and report peak RSS
+STARTUP_PROBE = """
+import sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+except ImportError:
+    peak_mb = float("nan")
+print(f"STARTUP {elapsed:.3f} {peak_mb:.1f}")
+"""
+
+
+def fetch(session, method: str, url: str, encoding: str, json_body=None):
+    """Send one request, returning (latency in seconds, bytes on the wire, decoded bytes, client socket)"""
+    headers = {"Accept-Encoding": encoding}
+    start = time.perf_counter()
+    response = session.request(method, url, json=json_body, headers=headers, stream=True, timeout=30)
+    # The local address identifies the TCP connection, so reconnects can be counted
+    sock = getattr(response.raw.connection, "sock", None)
+    local_address = sock.getsockname() if sock else None
+    raw = response.raw.read(decode_content=False)
+    latency = time.perf_counter() - start
+    response.raise_for_status()
+    body = gzip.decompress(raw) if response.headers.get("Content-Encoding") == "gzip" else raw
+    return latency, len(raw), len(body), local_address
+
+
+def run_scenario(base_url: str, requests_per_call: int, keep_alive: bool, encoding: str,
+                 idle_gap: float = 0) -> dict:
+    """Run the workload once and collect latency, bandwidth and connection figures.
+
+    With an idle_gap the client pauses that many seconds between repetitions,
+    as an MCP client does between tool calls, so the server's keep-alive
+    timeout decides whether the next call can reuse the connection.
+    """
+    latencies = []
+    wire_bytes = 0
+    body_bytes = 0
+    connections = set()
+    session = requests.Session()
+
+    calls = [("GET", f"{base_url}{path}", None) for path in STATIC_PATHS]
+    calls += [("POST", f"{base_url}/gradio_api/run/{api_name}", {"data": data}) for api_name, data in WORKLOAD]
+
+    for iteration in range(requests_per_call):
+        if idle_gap and iteration:
+            time.sleep(idle_gap)
+        for method, url, body in calls:
+            if not keep_alive:
+                session.close()
+                session = requests.Session()
+            latency, wire, decoded, local_address = fetch(session, method, url, encoding, body)
+            latencies.append(latency)
+            connections.add(local_address)
+            wire_bytes += wire
+            body_bytes += decoded
+    session.close()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "wire_kb": wire_bytes / 1024,
+        "body_kb": body_bytes / 1024,
+        "connections": len(connections),
+    }
+
+
+def measure_startup(build: str, profile_env: dict, runs: int) -> dict:
+    """Start the app in fresh interpreters and collect import/build time and peak memory"""
+    env = dict(os.environ, **profile_env)
+    times = []
+    peaks = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE, build],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        line = next(l for l in output.splitlines() if l.startswith("STARTUP "))
+        elapsed, peak_mb = line.split()[1:]
+        times.append(float(elapsed))
+        peaks.append(float(peak_mb))
+    return {
+        "startup_s": statistics.median(times),
+        "peak_rss_mb": statistics.median(peaks),
+    }
+
+
+def run_startup_benchmark(runs: int) -> int:
+    print(f"Measuring startup ({runs} runs per configuration)")
+    print(f"{'configuration':<28}{'startup s':>12}{'peak RSS MB':>14}")
+    for name, build, profile_env in STARTUP_PROFILES:
+        try:
+            result = measure_startup(build, profile_env, runs)
+        except subprocess.CalledProcessError as e:
+            print(f"Error: {name} failed to start: {e.stderr}")
+            return 1
+        print(f"{name:<28}{result['startup_s']:>12.2f}{result['peak_rss_mb']:>14.1f}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure latency and bandwidth of a running MCP Tools server")
+    parser.add_argument("--url", default="http://127.0.0.1:7860", help="Base URL of the running server")
+    parser.add_argument("-n", "--iterations", type=int, default=50, help="Times to repeat the workload per scenario")
+    parser.add_argument("--startup", action="store_true", help="Measure startup time and memory per app configuration instead")
+    parser.add_argument("--idle-gap", type=float, default=6, help="Seconds between calls in the idle keep-alive scenario (0 skips it)")
+    parser.add_argument("--idle-iterations", type=int, default=5, help="Times to repeat the workload in the idle keep-alive scenario")
+    args = parser.parse_args()
+
+    if args.startup:
+        return run_startup_benchmark(max(1, args.iterations // 10))
+
+    base_url = args.url.rstrip("/")
+    scenarios = [
+        ("new connection, identity", False, "identity", args.iterations, 0),
+        ("new connection, gzip", False, "gzip", args.iterations, 0),
+        ("keep-alive, identity", True, "identity", args.iterations, 0),
+        ("keep-alive, gzip", True, "gzip", args.iterations, 0),
+    ]
+    if args.idle_gap > 0:
+        # Longer than uvicorn's default 5s keep-alive, so reconnects show up unless the timeout is raised
+        scenarios.append((f"keep-alive, {args.idle_gap:g}s idle", True, "gzip", args.idle_iterations, args.idle_gap))
+
+    print(f"Benchmarking {base_url} ({args.iterations} iterations per scenario)")
+    print(f"{'scenario':<28}{'requests':>10}{'conns':>8}{'p50 ms':>10}{'p95 ms':>10}{'wire KB':>12}{'body KB':>12}")
+    for name, keep_alive, encoding, iterations, idle_gap in scenarios:
+        try:
+            result = run_scenario(base_url, iterations, keep_alive, encoding, idle_gap)
+        except requests.RequestException as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"{name:<28}{result['requests']:>10}{result['connections']:>8}{result['p50_ms']:>10.1f}"
+              f"{result['p95_ms']:>10.1f}{result['wire_kb']:>12.1f}{result['body_kb']:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,11 @@ import os
 import sys
 import json
 import logging
+from functools import lru_cache
 import requests
 import gradio as gr
 from dotenv import load_dotenv
+from tools import resources
 
 # Set up logging
 logging.basicConfig(
@@ -21,6 +23,12 @@ load_dotenv()
 
 def check_environment():
     """Check environment variables and return diagnostic info"""
+    # Copy so callers can't mutate the cached snapshot
+    return dict(_environment_snapshot())
+
+@lru_cache(maxsize=1)
+def _environment_snapshot():
+    """Collect diagnostic info once; the directory and environment scan is too slow to repeat per click"""
     # Check if running on Hugging Face Space
     is_hf_space = os.environ.get('SPACE_ID') is not None
     
@@ -57,6 +65,8 @@ def check_environment():
         "All environment variables (names only)": list(os.environ.keys())
     }
 
+resources.register("debug_environment_snapshot", shed=_environment_snapshot.cache_clear, priority=20)
+
 def test_api_call(location="London,UK", unit="metric"):
     """Test the OpenWeatherMap API call directly"""
     api_key = os.environ.get('WEATHER_API_KEY')
@@ -96,10 +106,8 @@ def test_api_call(location="London,UK", unit="metric"):
             "environment_check": check_environment()
         }
 
-# Create Gradio interface
-with gr.Blocks(title="API Debug Tool") as demo:
-    gr.Markdown("# Weather API Debug Tool")
-    
+def build_debug_tabs():
+    """Render the diagnostic tabs inside the current Blocks context"""
     with gr.Tab("Environment Check"):
         check_btn = gr.Button("Check Environment")
         env_output = gr.JSON(label="Environment Information")
@@ -114,5 +122,10 @@ with gr.Blocks(title="API Debug Tool") as demo:
         test_btn.click(fn=test_api_call, inputs=[location, unit], outputs=api_output)
 
 if __name__ == "__main__":
+    # Create Gradio interface
+    with gr.Blocks(title="API Debug Tool") as demo:
+        gr.Markdown("# Weather API Debug Tool")
+        build_debug_tabs()
+
     # Launch the app
     demo.launch(server_name="0.0.0.0", server_port=7861)
@@ -0,0 +1,178 @@
+import os
+import sys
+import json
+import time
+import signal
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sampling profiler settings. Profiles are written as collapsed stacks
+# ("frame;frame;frame count" per line), which flamegraph.pl and speedscope load directly.
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', '10'))
+PROFILE_MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '300'))
+# Length of a profile started with SIGUSR1
+PROFILE_SIGNAL_SECONDS = float(os.getenv('PROFILE_SIGNAL_SECONDS', '30'))
+PROFILE_TOP_N = 15
+
+# Functions that mark which tool a sampled stack belongs to. Sentiment scoring
+# runs on the batching worker thread, so score_sentiments identifies it there.
+TOOL_ENTRYPOINTS = {
+    "sentiment_interface": "sentiment_analysis",
+    "score_sentiments": "sentiment_analysis",
+    "weather_interface": "get_current_weather",
+    "calculator_interface": "simple_calculator",
+}
+
+# Leaf frames of threads that are blocked rather than using CPU. Only Python
+# frames are visible, so a thread blocked in a C call (time.sleep, a socket
+# read) shows up as the Python function that made the call; the known waiting
+# places in this app are listed here. Samples are taken on wall-clock time, so a
+# thread blocked anywhere else is still counted as if it were running.
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("blocks.py", "block_thread"),
+    # Memory monitor sleeping between checks
+    ("resources.py", "run"),
+    # Waiting on the weather API's response
+    ("socket.py", "readinto"),
+    ("ssl.py", "read"),
+    ("ssl.py", "recv_into"),
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads at a fixed interval for a limited time"""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000, output_dir: str = PROFILE_DIR):
+        self.interval = interval
+        self.output_dir = output_dir
+        self._lock = threading.Lock()
+        self._thread = None
+        self.last_result = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float) -> Optional[float]:
+        """
+        Start profiling in the background for seconds, clamped to PROFILE_MAX_SECONDS.
+        Returns the duration actually used, or None if a profile is already running.
+        """
+        seconds = max(0.1, min(seconds, PROFILE_MAX_SECONDS))
+        with self._lock:
+            if self.running:
+                return None
+            self._thread = threading.Thread(target=self._run, args=(seconds,), name="profiler", daemon=True)
+            self._thread.start()
+        logger.info(f"Sampling profiler started for {seconds}s (interval {self.interval * 1000} ms)")
+        return seconds
+
+    def status(self) -> dict:
+        return {"running": self.running, "last_result": self.last_result}
+
+    def _run(self, seconds: float) -> None:
+        stacks = Counter()
+        tool_functions: Dict[str, Counter] = defaultdict(Counter)
+        tool_samples = Counter()
+        samples = 0
+        started = time.time()
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            self._sample(stacks, tool_functions, tool_samples)
+            samples += 1
+            time.sleep(self.interval)
+
+        self.last_result = self._write(started, seconds, samples, stacks, tool_functions, tool_samples)
+        logger.info(f"Sampling profiler finished: {self.last_result['collapsed_file']}")
+
+    def _sample(self, stacks: Counter, tool_functions: Dict[str, Counter], tool_samples: Counter) -> None:
+        own_id = threading.get_ident()
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES:
+                continue
+
+            # Labels run from the leaf frame up to the thread's entry point
+            labels = []
+            tool = None
+            tool_depth = 0
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                if tool is None and frame.f_code.co_name in TOOL_ENTRYPOINTS:
+                    tool = TOOL_ENTRYPOINTS[frame.f_code.co_name]
+                    tool_depth = len(labels)
+                frame = frame.f_back
+            stacks[";".join([thread_names.get(thread_id, str(thread_id))] + labels[::-1])] += 1
+
+            if tool:
+                tool_samples[tool] += 1
+                # Inclusive time: each function from the tool entry point down counts once per sample
+                for label in set(labels[:tool_depth]):
+                    tool_functions[tool][label] += 1
+
+    def _write(self, started: float, seconds: float, samples: int, stacks: Counter,
+               tool_functions: Dict[str, Counter], tool_samples: Counter) -> dict:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started))
+        collapsed_file = os.path.join(self.output_dir, f"profile-{stamp}.collapsed")
+        summary_file = os.path.join(self.output_dir, f"profile-{stamp}.json")
+
+        with open(collapsed_file, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        result = {
+            "started_at": started,
+            "seconds": seconds,
+            "samples": samples,
+            "interval_ms": self.interval * 1000,
+            "collapsed_file": collapsed_file,
+            "summary_file": summary_file,
+            "top_functions_by_tool": {
+                tool: {
+                    "samples": tool_samples[tool],
+                    "functions": [
+                        {"function": label, "samples": count,
+                         "percent": round(100 * count / tool_samples[tool], 1)}
+                        for label, count in counter.most_common(PROFILE_TOP_N)
+                    ]
+                }
+                for tool, counter in tool_functions.items()
+            }
+        }
+        with open(summary_file, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        return result
+
+
+profiler = SamplingProfiler()
+
+
+def install_signal_handler() -> None:
+    """Start a PROFILE_SIGNAL_SECONDS profile on SIGUSR1 (not available on Windows)"""
+    if not hasattr(signal, "SIGUSR1"):
+        return
+
+    def handle(signum, frame):
+        if profiler.start(PROFILE_SIGNAL_SECONDS) is None:
+            logger.info("Profiler already running; ignoring SIGUSR1")
+
+    signal.signal(signal.SIGUSR1, handle)
+    logger.info(f"Send SIGUSR1 to pid {os.getpid()} to profile for {PROFILE_SIGNAL_SECONDS}s")
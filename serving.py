@@ -0,0 +1,207 @@
+import os
+import hmac
+import time
+import logging
+import contextlib
+from typing import List, Optional
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.middleware import Middleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+import warmup
+import profiler
+from tools import resources
+from tools.tracing import new_request_id, recent_traces
+
+logger = logging.getLogger(__name__)
+
+# Response compression settings. Responses smaller than GZIP_MIN_SIZE bytes are
+# sent as-is, since compressing them costs more CPU than it saves on the wire.
+# Server-sent event streams (Gradio queue, MCP SSE transport) are never compressed:
+# starlette>=0.46 skips text/event-stream responses, and SSEAwareGZipMiddleware
+# also passes through any request that asks for an event stream.
+GZIP_ENABLED = os.getenv('GZIP_ENABLED', 'True').lower() == 'true'
+GZIP_MIN_SIZE = int(os.getenv('GZIP_MIN_SIZE', '1024'))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '5'))
+
+# Bearer token for the /admin endpoints; they are not registered when unset
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+# Seconds an idle HTTP connection is kept open. uvicorn defaults to 5s, which
+# makes MCP clients calling in a loop reconnect (and redo TLS at the proxy) often.
+KEEP_ALIVE_TIMEOUT = int(os.getenv('KEEP_ALIVE_TIMEOUT', '30'))
+
+
+# Request headers stamped by RequestIdMiddleware and read back by the tool handlers
+REQUEST_ID_HEADER = "x-request-id"
+RECEIVED_AT_HEADER = "x-received-at"
+
+
+class RequestIdMiddleware:
+    """
+    Give every HTTP request an X-Request-ID, keeping one sent by the caller,
+    and stamp its arrival time so handlers can tell how long it waited in the
+    Gradio queue. The id is echoed back in the response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = [(k, v) for k, v in scope["headers"] if k != RECEIVED_AT_HEADER.encode()]
+        request_id = next((v[:64] for k, v in headers if k == REQUEST_ID_HEADER.encode()), None)
+        if request_id is None:
+            request_id = new_request_id().encode()
+            headers.append((REQUEST_ID_HEADER.encode(), request_id))
+        headers.append((RECEIVED_AT_HEADER.encode(), repr(time.time()).encode()))
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Request-ID", request_id.decode("latin-1"))
+            await send(message)
+
+        await self.app(dict(scope, headers=headers), receive, send_with_request_id)
+
+
+class SSEAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves event streams alone. A compressed stream is
+    buffered by the gzip encoder, so SSE clients would stall until it flushes.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            accept = Headers(scope=scope).get("accept", "")
+            if "text/event-stream" in accept:
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
+
+
+def request_trace_context(request) -> tuple:
+    """Return (request id, trace attributes) for a gr.Request, which is None outside HTTP calls"""
+    if request is None:
+        return None, {}
+    headers = request.headers
+    attributes = {}
+    received_at = headers.get(RECEIVED_AT_HEADER)
+    if received_at:
+        # Time from the HTTP request arriving until the handler started running
+        attributes["queue_ms"] = round((time.time() - float(received_at)) * 1000, 3)
+    return headers.get(REQUEST_ID_HEADER), attributes
+
+
+def build_middleware() -> list:
+    """Return the ASGI middleware stack to install on the Gradio FastAPI app"""
+    middleware = [Middleware(RequestIdMiddleware)]
+    if GZIP_ENABLED:
+        middleware.append(Middleware(SSEAwareGZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL))
+        logger.info(f"Response compression: gzip (level {GZIP_LEVEL}, min size {GZIP_MIN_SIZE} bytes)")
+    else:
+        logger.info("Response compression: Disabled by configuration.")
+    return middleware
+
+
+def tune_keep_alive(server) -> None:
+    """Apply the keep-alive timeout to a running uvicorn server.
+
+    Gradio builds the uvicorn config itself, so the timeout is set on the live
+    config; uvicorn reads it for every new connection.
+    """
+    if server is None:
+        logger.warning("No running server found; keep-alive timeout left at uvicorn default")
+        return
+    server.config.timeout_keep_alive = KEEP_ALIVE_TIMEOUT
+    logger.info(f"HTTP keep-alive timeout: {KEEP_ALIVE_TIMEOUT}s")
+
+
+def add_health_routes(app) -> None:
+    """Register /healthz (liveness) and /readyz (readiness) on the FastAPI app"""
+    async def healthz():
+        return {"status": "ok"}
+
+    async def readyz():
+        report = warmup.readiness_report()
+        return JSONResponse(report, status_code=200 if report["status"] == "ready" else 503)
+
+    app.add_api_route("/healthz", healthz, methods=["GET", "HEAD"], include_in_schema=False)
+    app.add_api_route("/readyz", readyz, methods=["GET", "HEAD"], include_in_schema=False)
+
+
+def _is_admin(request: Request) -> bool:
+    supplied = request.headers.get("authorization", "")
+    return hmac.compare_digest(supplied.encode(), f"Bearer {ADMIN_TOKEN}".encode())
+
+
+def add_admin_routes(app) -> None:
+    """Register token-protected diagnostics: the sampling profiler and recent traces"""
+    if not ADMIN_TOKEN:
+        logger.info("Admin endpoints: Disabled (set ADMIN_TOKEN to enable)")
+        return
+
+    unauthorized = JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    async def start_profile(request: Request, seconds: float = 30):
+        if not _is_admin(request):
+            return unauthorized
+        effective_seconds = profiler.profiler.start(seconds)
+        if effective_seconds is None:
+            return JSONResponse({"error": "a profile is already running"}, status_code=409)
+        return JSONResponse({"status": "started", "seconds": effective_seconds}, status_code=202)
+
+    async def profile_status(request: Request):
+        if not _is_admin(request):
+            return unauthorized
+        return profiler.profiler.status()
+
+    async def traces(request: Request, limit: int = 50):
+        if not _is_admin(request):
+            return unauthorized
+        return {"traces": recent_traces(limit)}
+
+    async def memory(request: Request):
+        if not _is_admin(request):
+            return unauthorized
+        return resources.memory_report()
+
+    app.add_api_route("/admin/profile", start_profile, methods=["POST"], include_in_schema=False)
+    app.add_api_route("/admin/profile", profile_status, methods=["GET"], include_in_schema=False)
+    app.add_api_route("/admin/traces", traces, methods=["GET"], include_in_schema=False)
+    app.add_api_route("/admin/memory", memory, methods=["GET"], include_in_schema=False)
+    logger.info("Admin endpoints: Enabled at /admin/profile, /admin/traces and /admin/memory")
+
+
+def build_lifespan(warmup_steps: List[warmup.WarmupStep]):
+    """Return a lifespan that adds the health and admin routes and starts warm-up before the port opens"""
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        add_health_routes(app)
+        add_admin_routes(app)
+        resources.start_monitor()
+        warmup.start_warmup(warmup_steps)
+        yield
+
+    return lifespan
+
+
+def launch_app(demo, server_name: str, server_port: int, show_error: bool = True,
+               warmup_steps: Optional[List[warmup.WarmupStep]] = None) -> None:
+    """Launch a Gradio app with compression and keep-alive tuning, blocking until interrupted"""
+    demo.launch(
+        server_name=server_name,
+        server_port=server_port,
+        show_error=show_error,
+        app_kwargs={
+            "middleware": build_middleware(),
+            "lifespan": build_lifespan(warmup_steps or [])
+        },
+        prevent_thread_lock=True
+    )
+    tune_keep_alive(demo.server)
+    profiler.install_signal_handler()
+    demo.block_thread()
@@ -0,0 +1,122 @@
+import time
+import threading
+import pytest
+from tools.batching import MicroBatcher
+
+
+def held_batcher(process_batch, max_batch_size=8):
+    """
+    Return a batcher whose first batch blocks until released, plus the release
+    event and a list of the batches it processed. Items submitted while the
+    first batch is held are queued, so they are collected into one batch.
+    """
+    release = threading.Event()
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        if len(batches) == 1:
+            release.wait(5)
+        return process_batch(items)
+
+    return MicroBatcher(process, max_batch_size=max_batch_size, max_wait=0.005), release, batches
+
+
+def submit_all(batcher, items):
+    """Submit each item from its own thread; returns (results, exceptions) keyed by item"""
+    results, errors = {}, {}
+
+    def call(item):
+        try:
+            results[item] = batcher.submit(item)
+        except Exception as e:
+            errors[item] = e
+
+    threads = [threading.Thread(target=call, args=(item,)) for item in items]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def wait_until(condition, timeout=5.0):
+    """Poll condition until it holds, failing the test instead of hanging if it never does"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the batcher"
+        time.sleep(0.001)
+
+
+def join_all(threads, timeout=5.0):
+    for thread in threads:
+        thread.join(timeout)
+        assert not thread.is_alive(), "submit() did not return"
+
+
+def test_results_fan_out_to_their_callers():
+    batcher, release, batches = held_batcher(lambda items: [item * 10 for item in items])
+    first, _, _ = submit_all(batcher, ["blocker"])
+    wait_until(lambda: batches)
+
+    threads, results, errors = submit_all(batcher, range(6))
+    wait_until(lambda: batcher._queue.qsize() == 6)
+    release.set()
+    join_all(first + threads)
+
+    assert errors == {}
+    assert results == {item: item * 10 for item in range(6)}
+    # All six waited out the held batch together and were scored as one
+    assert sorted(batches[1]) == list(range(6))
+
+
+def test_batch_exception_reaches_every_caller():
+    def fail(items):
+        raise ValueError("lexicon unavailable")
+
+    batcher, release, batches = held_batcher(fail)
+    first, _, first_errors = submit_all(batcher, ["blocker"])
+    wait_until(lambda: batches)
+
+    threads, results, errors = submit_all(batcher, range(4))
+    wait_until(lambda: batcher._queue.qsize() == 4)
+    release.set()
+    join_all(first + threads)
+
+    assert results == {}
+    assert len(batches[1]) == 4
+    assert set(errors) == set(range(4))
+    assert all(isinstance(e, ValueError) for e in list(errors.values()) + list(first_errors.values()))
+
+
+def test_result_count_mismatch_fails_the_batch():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=4)
+    with pytest.raises(RuntimeError, match="expected 1 results, got 0"):
+        batcher.submit("text")
+    # The worker survives a bad batch
+    batcher.process_batch = lambda items: list(items)
+    assert batcher.submit("text") == "text"
+
+
+def test_batch_size_one_calls_inline():
+    calling_threads = []
+
+    def process(items):
+        calling_threads.append(threading.get_ident())
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=1)
+    assert batcher.submit("text") == "TEXT"
+    assert calling_threads == [threading.get_ident()]
+    assert batcher._worker is None
+
+
+def test_idle_queue_resets_the_batch_window():
+    batcher = MicroBatcher(lambda items: list(items), max_batch_size=32, max_wait=0.005)
+    batcher.submit("warm-up")
+    # As left behind by a burst of large batches, followed by a second of idle queue
+    batcher._avg_batch_size = 30.0
+    batcher._last_batch_at -= 1.0
+    assert batcher.current_wait() > 0
+
+    batcher.submit("lone call")
+    assert batcher.stats()["avg_batch_size"] == 1.0
+    assert batcher.current_wait() == 0
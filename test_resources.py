@@ -0,0 +1,64 @@
+import pytest
+from tools import resources
+
+MB = resources.MB
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    """A 100 MB budget with one sheddable cache and a settable RSS reading in MB"""
+    rss = {"mb": 0}
+    shed_calls = []
+    monkeypatch.setattr(resources, "MEMORY_BUDGET_MB", 100.0)
+    monkeypatch.setattr(resources, "MEMORY_SHED_RATIO", 0.9)
+    monkeypatch.setattr(resources, "MEMORY_RELEASE_RATIO", 0.8)
+    monkeypatch.setattr(resources, "current_rss", lambda: rss["mb"] * MB)
+    monkeypatch.setattr(resources, "_components", {})
+    monkeypatch.setattr(resources, "_under_pressure", False)
+    monkeypatch.setattr(resources, "_last_shed_rss", 0)
+    resources.register("cache", shed=lambda: shed_calls.append(rss["mb"]), priority=10)
+    resources.register("pool", size=lambda: {"connections": 1})
+    return rss, shed_calls
+
+
+def test_shedding_has_hysteresis(memory):
+    rss, shed_calls = memory
+    # (RSS in MB, components shed, under pressure afterwards)
+    steps = [
+        (50, [], False),
+        (95, ["cache"], True),     # crosses the 90% shedding threshold
+        (95, [], True),            # still high, but nothing grew since the shed
+        (93, [], True),
+        (96, [], True),            # grew less than 5% of the budget past the last shed
+        (101, ["cache"], True),    # grew past it: shed again
+        (101, [], True),
+        (85, [], True),            # below shedding, above the 80% release threshold
+        (79, [], False),           # released
+        (80, [], False),
+        (91, ["cache"], True),     # crosses the threshold again
+    ]
+    for mb, expected_shed, expected_pressure in steps:
+        rss["mb"] = mb
+        assert resources.check_memory() == expected_shed, f"at {mb} MB"
+        assert resources.under_pressure() is expected_pressure, f"at {mb} MB"
+    assert shed_calls == [95, 101, 91]
+
+
+def test_shedding_stops_once_memory_is_released(memory):
+    rss, shed_calls = memory
+    rss["mb"] = 95
+    # Freeing the first component brings memory under the release threshold
+    resources.register("first", shed=lambda: rss.update(mb=70), priority=1)
+
+    assert resources.check_memory() == ["first"]
+    assert shed_calls == []
+    assert resources.under_pressure() is False
+
+
+def test_no_budget_never_sheds(memory, monkeypatch):
+    rss, shed_calls = memory
+    monkeypatch.setattr(resources, "MEMORY_BUDGET_MB", 0.0)
+    rss["mb"] = 500
+    assert resources.check_memory() == []
+    assert resources.under_pressure() is False
+    assert shed_calls == []
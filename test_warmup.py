@@ -0,0 +1,51 @@
+import threading
+import pytest
+import warmup
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """Warm-up state is process-wide; give each test its own"""
+    monkeypatch.setattr(warmup, "_ready", threading.Event())
+    monkeypatch.setattr(warmup, "_state", {"started_at": None, "completed_at": None, "steps": {}})
+
+
+def test_not_ready_until_the_last_step_finishes():
+    first_done = threading.Event()
+    last_started = threading.Event()
+    release_last = threading.Event()
+
+    def last():
+        last_started.set()
+        assert release_last.wait(5)
+
+    thread = warmup.start_warmup([("first", first_done.set), ("last", last)])
+    assert last_started.wait(5)
+
+    report = warmup.readiness_report()
+    assert report["status"] == "warming_up"
+    assert report["steps"]["first"]["status"] == "ok"
+    assert report["steps"]["last"] == {"status": "pending"}
+    assert report["completed_at"] is None
+
+    release_last.set()
+    thread.join(5)
+    assert not thread.is_alive()
+    report = warmup.readiness_report()
+    assert report["status"] == "ready"
+    assert report["steps"]["last"]["status"] == "ok"
+    assert report["completed_at"] is not None
+
+
+def test_failed_step_still_reports_ready():
+    def fail():
+        raise ConnectionError("weather API unreachable")
+
+    warmup.run_warmup([("weather_connection", fail), ("calculator", lambda: 2)])
+
+    report = warmup.readiness_report()
+    assert warmup.is_ready()
+    assert report["status"] == "ready"
+    assert report["steps"]["weather_connection"]["status"] == "failed"
+    assert "weather API unreachable" in report["steps"]["weather_connection"]["error"]
+    assert report["steps"]["calculator"]["status"] == "ok"
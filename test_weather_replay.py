@@ -0,0 +1,47 @@
+import threading
+import pytest
+import requests
+from weather_replay import FixtureStore, ReplayServer, WEATHER_PATH
+
+LOCATIONS = ["London, UK", "Tokyo, JP"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    for location in LOCATIONS:
+        store.save(location, "metric", {"status": 200, "elapsed_ms": 10, "body": {"name": location}})
+    return store
+
+
+def replay(store, order):
+    """Serve the fixtures with seeded error injection; return (statuses per location, connections used)"""
+    server = ReplayServer(("127.0.0.1", 0), store, error_rate=0.5, seed=7)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}{WEATHER_PATH}"
+    statuses = {}
+    connections = set()
+    try:
+        with requests.Session() as session:
+            for location in order:
+                response = session.get(url, params={"q": location, "units": "metric"}, stream=True, timeout=5)
+                connections.add(response.raw.connection.sock.getsockname())
+                response.content
+                statuses.setdefault(location, []).append(response.status_code)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(5)
+    return statuses, len(connections)
+
+
+def test_seeded_draws_do_not_depend_on_request_order(store):
+    grouped, grouped_connections = replay(store, [LOCATIONS[0]] * 8 + [LOCATIONS[1]] * 8)
+    interleaved, interleaved_connections = replay(store, [LOCATIONS[1], LOCATIONS[0]] * 8)
+
+    assert grouped == interleaved
+    # error_rate=0.5 injects some 503s, so the comparison covers both outcomes
+    assert {status for statuses in grouped.values() for status in statuses} == {200, 503}
+    # HTTP/1.1 keep-alive: every request reuses one connection
+    assert grouped_connections == interleaved_connections == 1
@@ -1,8 +1,25 @@
-from .weather_tool import get_current_weather
-from .calculator_tool import simple_calculator, SimpleCalculatorTool
+import importlib
+
+# Tool modules are imported on first use, so an app built without a tool never
+# loads its dependencies (TextBlob, the weather HTTP session, the batching worker)
+_EXPORTS = {
+    'get_current_weather': 'weather_tool',
+    'simple_calculator': 'calculator_tool',
+    'SimpleCalculatorTool': 'calculator_tool',
+    'analyze_sentiment': 'sentiment_tool',
+    'sentiment_batcher': 'sentiment_tool',
+}
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'get_current_weather',
     'simple_calculator',
-    'SimpleCalculatorTool'  # For backward compatibility
+    'SimpleCalculatorTool',  # For backward compatibility
+    'analyze_sentiment',
+    'sentiment_batcher'
 ]
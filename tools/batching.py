@@ -0,0 +1,119 @@
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    Collects concurrent single-item calls and processes them as one batch.
+
+    Callers block in submit() while a background worker groups queued items
+    into batches of at most max_batch_size and hands each batch to
+    process_batch, which must return one result per item in order.
+
+    The time the worker waits for more items adapts to load: it scales with the
+    recent average batch size, so a lone request under light traffic is
+    processed immediately, while under heavy traffic the worker waits up to
+    max_wait seconds for a batch to reach its recent average size. The average
+    resets once the queue has sat empty for longer than max_wait, so a call
+    after a burst has died down doesn't wait for companions that aren't coming.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 32, max_wait: float = 0.005, name: str = "batcher"):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.name = name
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        # Exponentially weighted moving average of recent batch sizes
+        self._avg_batch_size = 1.0
+        self._last_batch_at = 0.0
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item: Any) -> Any:
+        """Queue one item and block until its batch has been processed"""
+        if self.max_batch_size == 1:
+            return self.process_batch([item])[0]
+
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future))
+        return future.result()
+
+    def current_wait(self) -> float:
+        """Seconds the worker will wait to grow the next batch"""
+        load = (self._avg_batch_size - 1) / max(1, self.max_batch_size - 1)
+        return self.max_wait * min(1.0, load)
+
+    def stats(self) -> dict:
+        """Return counters describing how well calls are being batched"""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self._avg_batch_size, 2),
+            "current_wait_ms": round(self.current_wait() * 1000, 3),
+        }
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> list:
+        """Block for the first item, then gather more until the batch is full or the wait expires"""
+        batch = [self._queue.get()]
+        if time.monotonic() - self._last_batch_at > self.max_wait:
+            # Idle since the last batch: recent batch sizes no longer describe the load
+            self._avg_batch_size = 1.0
+        deadline = time.monotonic() + self.current_wait()
+        # Don't wait for more callers than recent batches have seen
+        expected = min(self.max_batch_size, max(1, round(self._avg_batch_size)))
+        while len(batch) < self.max_batch_size:
+            try:
+                # Items queued while the previous batch ran are taken without waiting
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            if len(batch) >= expected:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            self._avg_batch_size = 0.8 * self._avg_batch_size + 0.2 * len(batch)
+            self.batches += 1
+            self.items += len(batch)
+            try:
+                results = self.process_batch(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"{self.name}: expected {len(items)} results, got {len(results)}")
+            except Exception as e:
+                logger.error(f"{self.name}: batch of {len(items)} failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            finally:
+                self._last_batch_at = time.monotonic()
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,209 @@
+import gc
+import os
+import sys
+import time
+import logging
+import threading
+import contextlib
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Process-wide memory budget. 0 disables the budget; components still report their footprint.
+MEMORY_BUDGET_MB = float(os.getenv('MEMORY_BUDGET_MB', '0'))
+# Caches are shed once resident memory passes this fraction of the budget, and
+# the pressure state clears only after it falls below MEMORY_RELEASE_RATIO
+MEMORY_SHED_RATIO = float(os.getenv('MEMORY_SHED_RATIO', '0.9'))
+MEMORY_RELEASE_RATIO = float(os.getenv('MEMORY_RELEASE_RATIO', '0.8'))
+MEMORY_CHECK_INTERVAL = float(os.getenv('MEMORY_CHECK_INTERVAL', '5'))
+
+MB = 1024 * 1024
+# While under pressure, shed again only after RSS grows this fraction of the budget past the last shed
+RESHED_GROWTH_RATIO = 0.05
+
+class Component:
+    """A memory-holding part of the process: a cache, pool or loaded library"""
+
+    def __init__(self, name: str, size: Optional[Callable[[], Any]] = None,
+                 shed: Optional[Callable[[], None]] = None, priority: int = 50):
+        self.name = name
+        # Returns the estimated size in bytes, or a dict of descriptive stats
+        self.size = size
+        # Releases what can be rebuilt later; called under memory pressure
+        self.shed = shed
+        # Lower priorities are shed first
+        self.priority = priority
+        # Resident memory gained while the component loaded, if measured
+        self.loaded_bytes = None
+
+_components: Dict[str, Component] = {}
+_lock = threading.Lock()
+_under_pressure = False
+_last_shed_rss = 0
+_monitor = None
+
+def register(name: str, size: Optional[Callable[[], Any]] = None,
+             shed: Optional[Callable[[], None]] = None, priority: int = 50) -> Component:
+    """Register a component for footprint reporting and, if it can shed, for memory pressure"""
+    with _lock:
+        component = _components.setdefault(name, Component(name))
+        component.size = size
+        component.shed = shed
+        component.priority = priority
+    return component
+
+def current_rss() -> Optional[int]:
+    """Return the process's resident memory in bytes, or None if it can't be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+@contextlib.contextmanager
+def measure_load(name: str):
+    """Record how much resident memory a component gains while it loads"""
+    before = current_rss()
+    try:
+        yield
+    finally:
+        after = current_rss()
+        if before is not None and after is not None:
+            with _lock:
+                component = _components.setdefault(name, Component(name))
+            component.loaded_bytes = max(0, after - before)
+
+def deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate the memory held by a container and everything it references"""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in list(obj.items()))
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_sizeof(item, seen) for item in list(obj))
+    return size
+
+def budget_bytes() -> Optional[int]:
+    return int(MEMORY_BUDGET_MB * MB) if MEMORY_BUDGET_MB > 0 else None
+
+def under_pressure() -> bool:
+    """True while resident memory is above the shedding threshold; caches should not grow then"""
+    return _under_pressure
+
+def check_memory() -> List[str]:
+    """
+    Shed components, lowest priority first, when memory crosses the shedding threshold.
+
+    Freed memory is rarely returned to the OS, so RSS can stay above the
+    threshold after shedding. Once under pressure, components are shed again
+    only if RSS keeps growing, and pressure clears below the release threshold.
+    """
+    global _under_pressure, _last_shed_rss
+    budget = budget_bytes()
+    rss = current_rss()
+    if budget is None or rss is None:
+        _under_pressure = False
+        return []
+
+    threshold = budget * MEMORY_SHED_RATIO
+    release = budget * MEMORY_RELEASE_RATIO
+    if _under_pressure:
+        if rss < release:
+            _under_pressure = False
+            logger.info(f"Memory pressure cleared: {rss / MB:.0f} MB of {budget / MB:.0f} MB budget")
+            return []
+        if rss < _last_shed_rss + budget * RESHED_GROWTH_RATIO:
+            return []
+    elif rss <= threshold:
+        return []
+
+    with _lock:
+        sheddable = sorted((c for c in _components.values() if c.shed), key=lambda c: c.priority)
+    shed = []
+    for component in sheddable:
+        try:
+            component.shed()
+            shed.append(component.name)
+        except Exception as e:
+            logger.warning(f"Failed to shed {component.name}: {e}")
+        # Freed cache entries often sit in reference cycles
+        gc.collect()
+        rss = current_rss() or rss
+        if rss < release:
+            break
+    logger.warning(f"Memory pressure: {rss / MB:.0f} MB of {budget / MB:.0f} MB budget; shed {shed}")
+    _under_pressure = rss >= release
+    _last_shed_rss = rss
+    return shed
+
+def memory_report() -> dict:
+    """Return resident memory and the footprint of each registered component"""
+    rss = current_rss()
+    budget = budget_bytes()
+    with _lock:
+        components = sorted(_components.values(), key=lambda c: c.name)
+
+    report = {}
+    attributed = 0
+    for component in components:
+        entry = {}
+        if component.loaded_bytes is not None:
+            entry["loaded_mb"] = round(component.loaded_bytes / MB, 2)
+            attributed += component.loaded_bytes
+        if component.size:
+            try:
+                size = component.size()
+                if isinstance(size, dict):
+                    entry.update(size)
+                elif size is not None:
+                    entry["estimated_mb"] = round(size / MB, 3)
+                    attributed += size
+            except Exception as e:
+                entry["error"] = str(e)
+        entry["sheddable"] = component.shed is not None
+        report[component.name] = entry
+
+    return {
+        "rss_mb": round(rss / MB, 1) if rss is not None else None,
+        "budget_mb": MEMORY_BUDGET_MB or None,
+        "under_pressure": _under_pressure,
+        "components": report,
+        # Interpreter, libraries loaded before measurement started, and everything else
+        "unattributed_mb": round((rss - attributed) / MB, 1) if rss is not None else None
+    }
+
+def start_monitor() -> Optional[threading.Thread]:
+    """Check memory against the budget every MEMORY_CHECK_INTERVAL seconds; no-op without a budget"""
+    global _monitor
+    if budget_bytes() is None:
+        logger.info("Memory budget: None (set MEMORY_BUDGET_MB to enable shedding)")
+        return None
+    if current_rss() is None:
+        logger.warning(f"Memory budget: {MEMORY_BUDGET_MB:.0f} MB is not enforced; resident memory "
+                       "can't be read on this platform (install psutil to enable shedding)")
+        return None
+    if _monitor is not None and _monitor.is_alive():
+        return _monitor
+
+    def run():
+        while True:
+            try:
+                check_memory()
+            except Exception as e:
+                logger.error(f"Memory check failed: {e}")
+            time.sleep(MEMORY_CHECK_INTERVAL)
+
+    _monitor = threading.Thread(target=run, name="memory-monitor", daemon=True)
+    _monitor.start()
+    logger.info(f"Memory budget: {MEMORY_BUDGET_MB:.0f} MB (shedding above {MEMORY_SHED_RATIO:.0%}, "
+                f"released below {MEMORY_RELEASE_RATIO:.0%})")
+    return _monitor
@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import uuid
+import re
+import random
+import logging
+import threading
+import contextlib
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from . import resources
+
+logger = logging.getLogger(__name__)
+
+# Tracing settings. Every tool call records its spans; a finished trace is kept
+# if it is randomly sampled or slower than TRACE_SLOW_MS, so slow requests are
+# always available for a breakdown.
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'True').lower() == 'true'
+TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0.1'))
+TRACE_SLOW_MS = float(os.getenv('TRACE_SLOW_MS', '1000'))
+TRACE_BUFFER_SIZE = int(os.getenv('TRACE_BUFFER_SIZE', '500'))
+# With a memory budget set, kept traces may also use at most this fraction of it
+TRACE_BUFFER_BUDGET_RATIO = float(os.getenv('TRACE_BUFFER_BUDGET_RATIO', '0.02'))
+# Optional JSONL exporter; one finished trace per line
+TRACE_FILE = os.getenv('TRACE_FILE')
+
+# Credentials in URLs (e.g. OpenWeatherMap's appid) show up in request exception messages
+_SECRET_PARAM = re.compile(r"((?:appid|api_key|apikey|key|token)=)[^&\s'\"]+", re.IGNORECASE)
+
+def _describe_error(e: Exception) -> str:
+    return _SECRET_PARAM.sub(r"\1REDACTED", f"{type(e).__name__}: {e}")
+
+class Span:
+    """One timed stage of a traced request"""
+    __slots__ = ("name", "attributes", "start", "duration_ms", "children", "error")
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.start = time.perf_counter()
+        self.duration_ms = None
+        self.children: List["Span"] = []
+        self.error = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def finish(self) -> None:
+        self.duration_ms = round((time.perf_counter() - self.start) * 1000, 3)
+
+    def to_dict(self, trace_start: float) -> Dict[str, Any]:
+        record = {
+            "name": self.name,
+            "offset_ms": round((self.start - trace_start) * 1000, 3),
+            "duration_ms": self.duration_ms,
+        }
+        if self.attributes:
+            record["attributes"] = self.attributes
+        if self.error:
+            record["error"] = self.error
+        if self.children:
+            record["spans"] = [child.to_dict(trace_start) for child in self.children]
+        return record
+
+class _NoopSpan:
+    """Stand-in yielded when no trace is active, so callers can set attributes unconditionally"""
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+# (record, estimated bytes) pairs, oldest first
+_buffer: deque = deque()
+_buffer_bytes = 0
+_buffer_lock = threading.Lock()
+_file_lock = threading.Lock()
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+@contextlib.contextmanager
+def start_trace(name: str, request_id: Optional[str] = None, **attributes):
+    """
+    Open the root span of a traced request.
+
+    Nested calls (e.g. a tool invoked from another traced tool) become child
+    spans of the active trace instead of starting a new one.
+    """
+    if not TRACING_ENABLED:
+        yield _NOOP_SPAN
+        return
+    if _current_span.get() is not None:
+        with span(name, **attributes) as child:
+            yield child
+        return
+
+    root = Span(name, attributes)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except Exception as e:
+        root.error = _describe_error(e)
+        raise
+    finally:
+        root.finish()
+        _current_span.reset(token)
+        _export(root, request_id or new_request_id())
+
+@contextlib.contextmanager
+def span(name: str, **attributes):
+    """Time a stage of the current trace; does nothing outside a trace"""
+    parent = _current_span.get()
+    if parent is None:
+        yield _NOOP_SPAN
+        return
+
+    child = Span(name, attributes)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except Exception as e:
+        child.error = _describe_error(e)
+        raise
+    finally:
+        child.finish()
+        _current_span.reset(token)
+
+def _export(root: Span, request_id: str) -> None:
+    if root.duration_ms >= TRACE_SLOW_MS:
+        reason = "slow"
+    elif random.random() < TRACE_SAMPLE_RATE:
+        reason = "sampled"
+    else:
+        return
+
+    record = {
+        "request_id": request_id,
+        "timestamp": time.time(),
+        "kept": reason,
+        **root.to_dict(root.start),
+    }
+    # Under memory pressure the ring buffer only takes slow traces, still within its
+    # byte cap, so the requests worth a breakdown stay available; the file exporter
+    # keeps writing everything
+    if reason == "slow" or not resources.under_pressure():
+        _buffer_append(record)
+    if TRACE_FILE:
+        try:
+            line = json.dumps(record, default=str)
+            with _file_lock, open(TRACE_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write trace to {TRACE_FILE}: {e}")
+
+def _buffer_append(record: Dict[str, Any]) -> None:
+    """Keep a trace, evicting the oldest beyond TRACE_BUFFER_SIZE or the buffer's share of the budget"""
+    global _buffer_bytes
+    size = resources.deep_sizeof(record)
+    budget = resources.budget_bytes()
+    byte_limit = budget * TRACE_BUFFER_BUDGET_RATIO if budget else None
+    with _buffer_lock:
+        _buffer.append((record, size))
+        _buffer_bytes += size
+        while len(_buffer) > TRACE_BUFFER_SIZE or (byte_limit and len(_buffer) > 1 and _buffer_bytes > byte_limit):
+            _buffer_bytes -= _buffer.popleft()[1]
+
+def _buffer_size() -> int:
+    with _buffer_lock:
+        return _buffer_bytes
+
+def _shed_buffer() -> None:
+    global _buffer_bytes
+    with _buffer_lock:
+        _buffer.clear()
+        _buffer_bytes = 0
+
+resources.register("trace_buffer", size=_buffer_size, shed=_shed_buffer, priority=10)
+
+def recent_traces(limit: int = 50) -> List[Dict[str, Any]]:
+    """Return the most recent kept traces, newest first"""
+    with _buffer_lock:
+        traces = [record for record, _ in _buffer]
+    return traces[::-1][:limit]
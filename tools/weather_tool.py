@@ -1,10 +1,14 @@
 from typing import Dict, Any, Optional
 from smolagents.tools import tool
 import random
+import threading
 import requests
+from collections import Counter
 import os
 from dotenv import load_dotenv
 import logging
+from .tracing import span
+from . import resources
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -13,6 +17,45 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Point WEATHER_API_HOST at a local replay server (see weather_replay.py) for offline runs
+WEATHER_API_HOST = os.getenv('WEATHER_API_HOST', 'https://api.openweathermap.org').rstrip('/')
+WEATHER_API_URL = f"{WEATHER_API_HOST}/data/2.5/weather"
+
+# Set MOCK_WEATHER_SEED to make the mock fallback's conditions reproducible
+MOCK_WEATHER_SEED = os.getenv('MOCK_WEATHER_SEED')
+# Mock fallbacks served so far per (location, unit)
+_mock_sequence = Counter()
+_mock_lock = threading.Lock()
+
+# Shared session so repeated calls reuse pooled connections instead of
+# paying DNS and TLS setup every time
+_session = requests.Session()
+
+# Rough resident cost of one pooled connection: the socket and HTTP objects plus
+# OpenSSL's per-connection state and its 16 KB read and write record buffers
+_CONNECTION_BYTES = 64 * 1024
+
+def _pool_size() -> int:
+    """Estimate the memory held by the session's pools: open connections x per-connection buffers"""
+    connections = 0
+    for adapter in _session.adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            try:
+                queue = pools[key].pool
+            except KeyError:
+                continue
+            if queue is None:
+                continue
+            idle = sum(1 for conn in list(queue.queue) if conn is not None and conn.sock is not None)
+            checked_out = queue.maxsize - queue.qsize()
+            connections += idle + checked_out
+    return connections * _CONNECTION_BYTES
+
+# Reported only: pooled connections are small, and dropping them would make
+# every call reconnect while memory stays high
+resources.register("http_pool", size=_pool_size)
+
 # Use the basic tool decorator without parameters
 @tool
 def get_current_weather(location: str, unit: str = 'celsius') -> str:
@@ -33,24 +76,27 @@ def get_current_weather(location: str, unit: str = 'celsius') -> str:
     
     # Try to get real weather data from API
     try:
-        return get_real_weather(location, unit)
+        with span("weather.real"):
+            return get_real_weather(location, unit)
     except Exception as e:
         logger.warning(f"Failed to get real weather data: {e}. Falling back to mock data.")
-        return get_mock_weather(location, unit)
+        with span("weather.mock_fallback"):
+            return get_mock_weather(location, unit)
 
 def get_real_weather(location: str, unit: str) -> str:
     """Get real weather data from a weather API"""
-    # Check if running on Hugging Face Space
-    is_hf_space = os.environ.get('SPACE_ID') is not None
-    logger.info(f"Running on Hugging Face Space: {is_hf_space}")
-    
-    # Get API key from environment variable
-    api_key = os.getenv('WEATHER_API_KEY')
-    
-    # Log environment variables for debugging (without exposing the actual key)
-    env_vars = [k for k in os.environ.keys() if 'API' in k or 'KEY' in k or 'WEATHER' in k or 'HF_' in k or 'SPACE' in k]
-    logger.info(f"Available environment variables that might contain API keys: {env_vars}")
-    logger.info(f"API key found: {api_key is not None}")
+    with span("weather.env_scan"):
+        # Check if running on Hugging Face Space
+        is_hf_space = os.environ.get('SPACE_ID') is not None
+        logger.info(f"Running on Hugging Face Space: {is_hf_space}")
+        
+        # Get API key from environment variable
+        api_key = os.getenv('WEATHER_API_KEY')
+        
+        # Log environment variables for debugging (without exposing the actual key)
+        env_vars = [k for k in os.environ.keys() if 'API' in k or 'KEY' in k or 'WEATHER' in k or 'HF_' in k or 'SPACE' in k]
+        logger.info(f"Available environment variables that might contain API keys: {env_vars}")
+        logger.info(f"API key found: {api_key is not None}")
     
     if not api_key:
         logger.warning("No WEATHER_API_KEY found in environment variables")
@@ -61,20 +107,29 @@ def get_real_weather(location: str, unit: str) -> str:
     unit_symbol = "C" if unit.lower() == "celsius" else "F"
     
     # Make API request to OpenWeatherMap (you can replace with your preferred API)
-    url = f"https://api.openweathermap.org/data/2.5/weather?q={location}&units={units}&appid={api_key}"
+    url = f"{WEATHER_API_URL}?q={location}&units={units}&appid={api_key}"
     
     logger.info(f"Making API request to: {url.replace(api_key, 'API_KEY_HIDDEN')}")
     
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()  # Raise exception for HTTP errors
+        with span("weather.http") as http_span:
+            # A new pooled connection means this call paid for DNS, TCP and TLS setup
+            pool = _session.get_adapter(url).poolmanager.connection_from_url(url)
+            connections_before = pool.num_connections
+            response = _session.get(url, timeout=10)
+            http_span.set_attribute("status_code", response.status_code)
+            http_span.set_attribute("new_connection", pool.num_connections > connections_before)
+            # Time from sending the request until the response headers arrived
+            http_span.set_attribute("upstream_ms", round(response.elapsed.total_seconds() * 1000, 3))
+            response.raise_for_status()  # Raise exception for HTTP errors
         logger.info(f"API response status code: {response.status_code}")
     
-        data = response.json()
-        logger.info(f"API response data keys: {data.keys()}")
-        
-        temp = round(data["main"]["temp"])
-        condition = data["weather"][0]["main"]
+        with span("weather.parse"):
+            data = response.json()
+            logger.info(f"API response data keys: {data.keys()}")
+            
+            temp = round(data["main"]["temp"])
+            condition = data["weather"][0]["main"]
         
         logger.info(f"Successfully parsed weather data: {temp}°{unit_symbol}, {condition}")
         return f"Weather in {location}: {temp}°{unit_symbol}, {condition}"
@@ -82,6 +137,24 @@ def get_real_weather(location: str, unit: str) -> str:
         logger.error(f"Error during API request or parsing: {str(e)}")
         raise
 
+def prime_connection() -> None:
+    """Open a pooled connection to the weather API ahead of the first real call"""
+    response = _session.head(WEATHER_API_HOST, timeout=5)
+    logger.info(f"Primed weather API connection (status {response.status_code})")
+
+def _mock_random(location: str, unit: str):
+    """
+    Return the random source for one mock fallback. With a seed it depends only
+    on the seed, the location and unit, and how many fallbacks for that pair came
+    before, so concurrent fallbacks for other locations can't change the result.
+    """
+    if MOCK_WEATHER_SEED is None:
+        return random
+    with _mock_lock:
+        sequence = _mock_sequence[(location, unit)]
+        _mock_sequence[(location, unit)] += 1
+    return random.Random(f"{MOCK_WEATHER_SEED}:{location}:{unit}:{sequence}")
+
 def get_mock_weather(location: str, unit: str) -> str:
     """Provide mock weather data as a fallback"""
     # Mock temperature in Celsius (base value)
@@ -98,6 +171,6 @@ def get_mock_weather(location: str, unit: str) -> str:
     
     # List of possible weather conditions
     conditions = ["Sunny", "Partly Cloudy", "Cloudy", "Light Rain", "Clear"]
-    condition = random.choice(conditions)
+    condition = _mock_random(location, unit).choice(conditions)
     
     return f"Weather in {location}: {temp}°{unit_symbol}, {condition} (Mock Data)"
@@ -0,0 +1,71 @@
+import time
+import logging
+import threading
+from typing import Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A warm-up step is a (name, callable) pair; the callable's return value is ignored
+WarmupStep = Tuple[str, Callable[[], object]]
+
+_ready = threading.Event()
+_lock = threading.Lock()
+_state = {
+    "started_at": None,
+    "completed_at": None,
+    "steps": {}
+}
+
+
+def is_ready() -> bool:
+    """Return True once warm-up has finished"""
+    return _ready.is_set()
+
+
+def readiness_report() -> dict:
+    """Return warm-up progress for the readiness endpoint"""
+    with _lock:
+        return {
+            "status": "ready" if is_ready() else "warming_up",
+            "started_at": _state["started_at"],
+            "completed_at": _state["completed_at"],
+            "steps": {name: dict(step) for name, step in _state["steps"].items()}
+        }
+
+
+def run_warmup(steps: List[WarmupStep]) -> None:
+    """
+    Run each warm-up step in order, then mark the process ready.
+
+    A failing step is logged and recorded but does not block readiness: every
+    tool has a fallback path (e.g. mock weather data), so the process can still
+    serve traffic.
+    """
+    with _lock:
+        _state["started_at"] = time.time()
+        _state["steps"] = {name: {"status": "pending"} for name, _ in steps}
+
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+            status = {"status": "ok"}
+        except Exception as e:
+            logger.warning(f"Warm-up step '{name}' failed: {e}")
+            status = {"status": "failed", "error": str(e)}
+        status["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        logger.info(f"Warm-up step '{name}': {status['status']} in {status['duration_ms']} ms")
+        with _lock:
+            _state["steps"][name] = status
+
+    with _lock:
+        _state["completed_at"] = time.time()
+    _ready.set()
+    logger.info("Warm-up complete; reporting ready")
+
+
+def start_warmup(steps: List[WarmupStep]) -> threading.Thread:
+    """Run warm-up in a background thread so the liveness endpoint answers immediately"""
+    thread = threading.Thread(target=run_warmup, args=(steps,), name="warmup", daemon=True)
+    thread.start()
+    return thread
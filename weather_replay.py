@@ -0,0 +1,211 @@
+"""
+Record/replay transport for the weather tool.
+
+Record real OpenWeatherMap responses once, then serve them from a local stub
+server with configurable latency and error injection, so weather performance
+can be benchmarked deterministically and offline:
+
+    python weather_replay.py record "London, UK" "Tokyo, JP" --units metric imperial
+    python weather_replay.py serve --port 8765 --latency-ms 80 --error-rate 0.05 --seed 1
+    WEATHER_API_HOST=http://127.0.0.1:8765 WEATHER_API_KEY=replay MOCK_WEATHER_SEED=1 python app.py
+    python benchmark.py
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+import requests
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+from dotenv import load_dotenv
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+FIXTURE_DIR = os.getenv('WEATHER_FIXTURE_DIR', os.path.join('fixtures', 'weather'))
+LIVE_API_URL = "https://api.openweathermap.org/data/2.5/weather"
+WEATHER_PATH = "/data/2.5/weather"
+
+
+class FixtureStore:
+    """Recorded weather API responses, one JSON file per (location, units) pair"""
+
+    def __init__(self, directory: str = FIXTURE_DIR):
+        self.directory = directory
+
+    def path(self, location: str, units: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "_", location.lower()).strip("_")
+        return os.path.join(self.directory, f"{slug}-{units}.json")
+
+    def load(self, location: str, units: str) -> Optional[dict]:
+        try:
+            with open(self.path(location, units), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, location: str, units: str, fixture: dict) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(location, units)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, indent=2, ensure_ascii=False)
+        return path
+
+
+def record(store: FixtureStore, locations: list, units_list: list) -> int:
+    """Fetch each location from the live API and save the response as a fixture"""
+    api_key = os.getenv('WEATHER_API_KEY')
+    if not api_key:
+        logger.error("WEATHER_API_KEY is required to record fixtures")
+        return 1
+
+    for location in locations:
+        for units in units_list:
+            response = requests.get(LIVE_API_URL, params={"q": location, "units": units, "appid": api_key}, timeout=10)
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text
+            fixture = {
+                "location": location,
+                "units": units,
+                "status": response.status_code,
+                "elapsed_ms": round(response.elapsed.total_seconds() * 1000, 1),
+                "recorded_at": time.time(),
+                "body": body,
+            }
+            path = store.save(location, units, fixture)
+            logger.info(f"Recorded {location} ({units}): HTTP {response.status_code} -> {path}")
+    return 0
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Serves recorded fixtures in place of the weather API"""
+    daemon_threads = True
+
+    def __init__(self, address, store: FixtureStore, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0, recorded_latency: bool = False, seed: Optional[int] = None):
+        super().__init__(address, ReplayHandler)
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.recorded_latency = recorded_latency
+        self.seed = seed
+        # Requests seen so far per (location, units)
+        self._sequence = Counter()
+        self._sequence_lock = threading.Lock()
+
+    def draw(self, location: str, units: str, fixture: Optional[dict]) -> tuple:
+        """
+        Return (delay in seconds, whether to inject an error) for one request.
+
+        With a seed, the draw depends only on the seed, the request's location
+        and units, and how many requests for that pair came before it, so a run
+        is reproducible however concurrent requests for other pairs interleave.
+        """
+        with self._sequence_lock:
+            sequence = self._sequence[(location, units)]
+            self._sequence[(location, units)] += 1
+        rng = random.Random(f"{self.seed}:{location}:{units}:{sequence}") if self.seed is not None else random
+        base = fixture.get("elapsed_ms", 0) if self.recorded_latency and fixture else self.latency_ms
+        delay = max(0.0, base + rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+        fail = rng.random() < self.error_rate
+        return delay, fail
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    server: ReplayServer
+    # Keep connections open like the real API, so the weather tool's pooled
+    # session is exercised; every response sends a Content-Length
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        # Lets the weather tool's connection priming succeed against the stub
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != WEATHER_PATH:
+            self._send_json(404, {"cod": 404, "message": "Internal error"})
+            return
+
+        query = parse_qs(url.query)
+        location = query.get("q", [""])[0]
+        units = query.get("units", ["standard"])[0]
+        fixture = self.server.store.load(location, units)
+
+        delay, fail = self.server.draw(location, units, fixture)
+        time.sleep(delay)
+        if fail:
+            self._send_json(503, {"cod": 503, "message": "Injected error"})
+        elif fixture is None:
+            self._send_json(404, {"cod": "404", "message": "city not found"})
+        else:
+            self._send_json(fixture["status"], fixture["body"])
+
+    def _send_json(self, status: int, body) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Record and replay OpenWeatherMap responses")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="Fixture directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Record live API responses as fixtures")
+    record_parser.add_argument("locations", nargs="+", help="Locations to record, e.g. 'Paris, FR'")
+    record_parser.add_argument("--units", nargs="+", default=["metric", "imperial"], help="Unit systems to record")
+
+    serve_parser = commands.add_parser("serve", help="Serve fixtures from a local stub server")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--latency-ms", type=float, default=0, help="Added latency per request")
+    serve_parser.add_argument("--jitter-ms", type=float, default=0, help="Uniform +/- jitter on the latency")
+    serve_parser.add_argument("--recorded-latency", action="store_true", help="Replay each fixture's recorded latency instead of --latency-ms")
+    serve_parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests answered with HTTP 503")
+    serve_parser.add_argument("--seed", type=int, default=None, help="Seed for latency jitter and error injection")
+
+    args = parser.parse_args()
+    store = FixtureStore(args.fixtures)
+
+    if args.command == "record":
+        return record(store, args.locations, args.units)
+
+    server = ReplayServer(
+        (args.host, args.port), store,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        recorded_latency=args.recorded_latency, seed=args.seed
+    )
+    logger.info(f"Replaying fixtures from {args.fixtures} on http://{args.host}:{args.port}")
+    logger.info(f"Set WEATHER_API_HOST=http://{args.host}:{args.port} to point the weather tool here")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())